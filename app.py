@@ -1,45 +1,213 @@
 # main.py
 import sqlite3
-from fastapi import FastAPI, HTTPException, Depends, status, Header
-from pydantic import BaseModel, constr
-from typing import Optional, List
-from datetime import datetime, timedelta
+from fastapi import FastAPI, HTTPException, Depends, status, Header, Response
+from pydantic import BaseModel, TypeAdapter, conint, constr
+from cachetools import TTLCache
+from typing import Optional, List, Literal
+from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import enum
+import functools
+import hashlib
 import os
+import threading
+import time
 
 DB_FILE = "voting.db"
 
-# --- Init DB ---
-def init_db():
-    conn = sqlite3.connect(DB_FILE)
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+)
+
+# --- SQL ---
+# hot statements are fixed strings so sqlite3's per-connection statement cache reuses them
+# column order shared by every statement that feeds proposal_out()/vote_out()
+_PROPOSAL_COLS = ("id", "title", "description", "created_at", "deadline", "status",
+                  "yes_count", "no_count", "abstain_count")
+_VOTE_COLS = ("id", "proposal_id", "voter_name", "vote", "voted_at")
+_PROPOSAL_SELECT = ", ".join(_PROPOSAL_COLS)
+_VOTE_SELECT = ", ".join(_VOTE_COLS)
+
+SQL_GET_PROPOSAL = f"SELECT {_PROPOSAL_SELECT} FROM proposals WHERE id=?"
+SQL_LIST_PROPOSALS = f"SELECT {_PROPOSAL_SELECT} FROM proposals"
+SQL_INSERT_PROPOSAL = ("INSERT INTO proposals (title, description, created_at, deadline, status) "
+                       f"VALUES (?,?,?,?,?) RETURNING {_PROPOSAL_SELECT}")
+SQL_SET_PROPOSAL_STATUS = "UPDATE proposals SET status=? WHERE id=?"
+SQL_SWEEP_EXPIRED = "UPDATE proposals SET status='expired' WHERE status='active' AND deadline < ?"
+SQL_GET_VOTE = f"SELECT {_VOTE_SELECT} FROM votes WHERE id=?"
+# inserts only when the proposal is open and the voter has not voted yet
+SQL_INSERT_VOTE = ("INSERT INTO votes (proposal_id, voter_name, vote, voted_at) SELECT ?,?,?,? "
+                   "WHERE EXISTS (SELECT 1 FROM proposals WHERE id=? AND status='active' AND deadline >= ?) "
+                   "AND NOT EXISTS (SELECT 1 FROM votes WHERE proposal_id=? AND voter_name=?) "
+                   f"RETURNING {_VOTE_SELECT}")
+SQL_INSERT_VOTE_BULK = "INSERT INTO votes (proposal_id, voter_name, vote, voted_at) VALUES (?,?,?,?)"
+SQL_LAST_VOTES = f"SELECT * FROM (SELECT {_VOTE_SELECT} FROM votes ORDER BY id DESC LIMIT ?) ORDER BY id"
+SQL_DELETE_VOTE = "DELETE FROM votes WHERE id=?"
+SQL_LIST_VOTES = f"SELECT {_VOTE_SELECT} FROM votes"
+
+# --- Connection ---
+def connect_db():
+    # one long-lived connection keeps its page cache warm across requests
+    conn = sqlite3.connect(DB_FILE, check_same_thread=False, isolation_level=None,
+                           cached_statements=256)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+DB = connect_db()
+# the connection is only ever used from the single DB_EXECUTOR thread (and by init_db
+# before it starts), which serializes all access; the lock just guards transaction
+# nesting and its bookkeeping for write paths
+DB_WRITE_LOCK = threading.RLock()
+# how many write_transaction blocks are open; only touched under DB_WRITE_LOCK
+_tx_depth = 0
+
+def row_cursor(conn):
+    # the connection keeps the default (fastest) tuple rows; use named rows where convenient
     cur = conn.cursor()
+    cur.row_factory = sqlite3.Row
+    return cur
 
-    # proposals table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS proposals (
+@contextmanager
+def write_transaction(conn):
+    # one BEGIN IMMEDIATE ... COMMIT per request, so at most one sync per handler;
+    # nested use joins the outer transaction
+    global _tx_depth
+    with DB_WRITE_LOCK:
+        if _tx_depth:
+            _tx_depth += 1
+            try:
+                yield conn
+            finally:
+                _tx_depth -= 1
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        _tx_depth = 1
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            # also covers a failed COMMIT, so no transaction is left open for the next writer
+            try:
+                conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            raise
+        finally:
+            _tx_depth = 0
+
+def in_write_transaction():
+    return _tx_depth > 0
+
+# --- Init DB ---
+# timestamps are stored as INTEGER unix epoch seconds (UTC)
+PROPOSALS_COLUMNS = """
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         title TEXT NOT NULL,
         description TEXT NOT NULL,
-        created_at TEXT NOT NULL,
-        deadline TEXT NOT NULL,
-        status TEXT NOT NULL
-    );
-    """)
+        created_at INTEGER NOT NULL,
+        deadline INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        yes_count INTEGER NOT NULL DEFAULT 0,
+        no_count INTEGER NOT NULL DEFAULT 0,
+        abstain_count INTEGER NOT NULL DEFAULT 0
+"""
 
-    # votes table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS votes (
+VOTES_COLUMNS = """
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         proposal_id INTEGER NOT NULL,
         voter_name TEXT NOT NULL,
         vote TEXT NOT NULL CHECK(vote IN ('yes','no','abstain')),
-        voted_at TEXT NOT NULL,
+        voted_at INTEGER NOT NULL,
         UNIQUE(proposal_id, voter_name),
         FOREIGN KEY(proposal_id) REFERENCES proposals(id) ON DELETE CASCADE
-    );
+"""
+
+def migrate_iso_timestamps(cur):
+    # databases created with ISO-8601 TEXT timestamps: rebuild both tables with INTEGER columns
+    cur.execute("PRAGMA foreign_keys=OFF")
+    cur.execute("BEGIN")
+    try:
+        cur.execute(f"CREATE TABLE proposals_new ({PROPOSALS_COLUMNS});")
+        cur.execute("""
+        INSERT INTO proposals_new
+        SELECT id, title, description,
+               CAST(strftime('%s', created_at) AS INTEGER), CAST(strftime('%s', deadline) AS INTEGER),
+               status, yes_count, no_count, abstain_count
+        FROM proposals;
+        """)
+        cur.execute(f"CREATE TABLE votes_new ({VOTES_COLUMNS});")
+        cur.execute("""
+        INSERT INTO votes_new
+        SELECT id, proposal_id, voter_name, vote, CAST(strftime('%s', voted_at) AS INTEGER)
+        FROM votes;
+        """)
+        cur.execute("DROP TABLE votes")
+        cur.execute("DROP TABLE proposals")
+        cur.execute("ALTER TABLE proposals_new RENAME TO proposals")
+        cur.execute("ALTER TABLE votes_new RENAME TO votes")
+        cur.execute("COMMIT")
+    except Exception:
+        cur.execute("ROLLBACK")
+        raise
+    finally:
+        cur.execute("PRAGMA foreign_keys=ON")
+
+def init_db():
+    cur = row_cursor(DB)
+
+    # proposals table
+    cur.execute(f"CREATE TABLE IF NOT EXISTS proposals ({PROPOSALS_COLUMNS});")
+
+    # databases created before the tally columns existed: add and backfill them
+    cols = {r["name"] for r in cur.execute("PRAGMA table_info(proposals)")}
+    if "yes_count" not in cols:
+        for col in ("yes_count", "no_count", "abstain_count"):
+            cur.execute(f"ALTER TABLE proposals ADD COLUMN {col} INTEGER NOT NULL DEFAULT 0")
+        cur.execute("""
+        UPDATE proposals SET
+            yes_count = (SELECT COUNT(*) FROM votes WHERE proposal_id = proposals.id AND vote = 'yes'),
+            no_count = (SELECT COUNT(*) FROM votes WHERE proposal_id = proposals.id AND vote = 'no'),
+            abstain_count = (SELECT COUNT(*) FROM votes WHERE proposal_id = proposals.id AND vote = 'abstain');
+        """)
+
+    # votes table
+    cur.execute(f"CREATE TABLE IF NOT EXISTS votes ({VOTES_COLUMNS});")
+
+    types = {r["name"]: r["type"] for r in cur.execute("PRAGMA table_info(proposals)")}
+    if types["deadline"] == "TEXT":
+        migrate_iso_timestamps(cur)
+
+    # tally lookups; the UNIQUE(proposal_id, voter_name) index covers duplicate-vote checks
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_votes_proposal ON votes(proposal_id);")
+
+    # keep the proposal tally columns in step with the votes table
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS votes_ai AFTER INSERT ON votes BEGIN
+        UPDATE proposals SET
+            yes_count = yes_count + (NEW.vote = 'yes'),
+            no_count = no_count + (NEW.vote = 'no'),
+            abstain_count = abstain_count + (NEW.vote = 'abstain')
+        WHERE id = NEW.proposal_id;
+    END;
+    """)
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS votes_ad AFTER DELETE ON votes BEGIN
+        UPDATE proposals SET
+            yes_count = yes_count - (OLD.vote = 'yes'),
+            no_count = no_count - (OLD.vote = 'no'),
+            abstain_count = abstain_count - (OLD.vote = 'abstain')
+        WHERE id = OLD.proposal_id;
+    END;
     """)
-    conn.commit()
-    conn.close()
+    cur.execute("ANALYZE;")
 
 init_db()
 
@@ -53,7 +221,8 @@ class ProposalStatus(str, enum.Enum):
 class ProposalCreate(BaseModel):
     title: constr(min_length=1)
     description: constr(min_length=1)
-    days_open: Optional[int] = 2
+    # bounded so the epoch deadline always converts back to a datetime
+    days_open: Optional[conint(ge=-36500, le=36500)] = 2
 
 class ProposalOut(BaseModel):
     id: int
@@ -68,7 +237,7 @@ class ProposalOut(BaseModel):
 
 class VoteCreate(BaseModel):
     voter_name: constr(min_length=1)
-    vote: constr(regex="^(yes|no|abstain)$")
+    vote: Literal["yes", "no", "abstain"]
 
 class VoteOut(BaseModel):
     id: int
@@ -80,156 +249,243 @@ class VoteOut(BaseModel):
 # --- FastAPI ---
 app = FastAPI(title="Community Digital Voting System (SQLite3)")
 
-def get_conn():
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+# every sqlite3 call runs on this one thread, so handlers can be async without
+# blocking the event loop or tying up the shared threadpool
+DB_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+
+async def run_db(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(DB_EXECUTOR, functools.partial(fn, *args))
+
+async def get_conn():
+    yield DB
+
+# --- Response cache ---
+# serialized GET bodies, keyed by ("proposal", id) or ("proposals",); writers invalidate
+RESPONSE_CACHE = TTLCache(maxsize=1024, ttl=1)
+RESPONSE_CACHE_LOCK = threading.Lock()
+# bumped on every invalidation so a body built from pre-write data is not cached
+_cache_generation = 0
+PROPOSAL_LIST_ADAPTER = TypeAdapter(List[ProposalOut])
+VOTE_LIST_ADAPTER = TypeAdapter(List[VoteOut])
+
+def invalidate_cache(*keys):
+    global _cache_generation
+    with RESPONSE_CACHE_LOCK:
+        _cache_generation += 1
+        if keys:
+            for key in keys:
+                RESPONSE_CACHE.pop(key, None)
+        else:
+            RESPONSE_CACHE.clear()
+
+async def cached_json(key, build, if_none_match: Optional[str]):
+    # cache hits are answered on the event loop without touching the database thread
+    with RESPONSE_CACHE_LOCK:
+        entry = RESPONSE_CACHE.get(key)
+        generation = _cache_generation
+    if entry is None:
+        body = await run_db(build)
+        entry = (body, f'"{hashlib.md5(body).hexdigest()}"')
+        with RESPONSE_CACHE_LOCK:
+            if generation == _cache_generation:
+                RESPONSE_CACHE[key] = entry
+    body, etag = entry
+    headers = {"ETag": etag, "Cache-Control": "max-age=1"}
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # --- Helpers ---
+def proposal_out(row):
+    # row is in _PROPOSAL_COLS order and comes from our own schema, so skip pydantic validation
+    pid, title, description, created_at, deadline, proposal_status, yes, no, abstain = row
+    return ProposalOut.model_construct(id=pid, title=title, description=description,
+                                       created_at=datetime.utcfromtimestamp(created_at),
+                                       deadline=datetime.utcfromtimestamp(deadline),
+                                       status=ProposalStatus(proposal_status), yes_count=yes,
+                                       no_count=no, abstain_count=abstain)
+
+def vote_out(row):
+    # row is in _VOTE_COLS order
+    vid, pid, name, vote, voted_at = row
+    return VoteOut.model_construct(id=vid, proposal_id=pid, voter_name=name,
+                                   vote=vote, voted_at=datetime.utcfromtimestamp(voted_at))
+
+# epoch second of the last committed standalone sweep
+_last_sweep = 0
+
+def _sweep_expired(conn):
+    # expire every overdue proposal at once; deadlines have one-second resolution,
+    # so reads skip the UPDATE when a sweep already committed this second
+    global _last_sweep
+    now = int(time.time())
+    if now == _last_sweep and not in_write_transaction():
+        return
+    with DB_WRITE_LOCK:
+        # inside a handler's transaction always sweep: a rollback would discard it
+        nested = in_write_transaction()
+        with write_transaction(conn):
+            expired = conn.execute(SQL_SWEEP_EXPIRED, (now,)).rowcount
+    if expired:
+        invalidate_cache()
+    if not nested:
+        _last_sweep = now
+
+async def sweep_expired(conn):
+    # only hop to the database thread when this second has not been swept yet
+    if int(time.time()) != _last_sweep:
+        await run_db(_sweep_expired, conn)
+
 def get_proposal_or_404(conn, proposal_id: int):
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM proposals WHERE id=?", (proposal_id,))
+    cur = row_cursor(conn)
+    cur.execute(SQL_GET_PROPOSAL, (proposal_id,))
     row = cur.fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Proposal not found")
-    # check expiry
-    deadline = datetime.fromisoformat(row["deadline"])
-    if row["status"] == ProposalStatus.active.value and datetime.utcnow() > deadline:
-        cur.execute("UPDATE proposals SET status=? WHERE id=?", (ProposalStatus.expired.value, proposal_id))
-        conn.commit()
-        cur.execute("SELECT * FROM proposals WHERE id=?", (proposal_id,))
-        row = cur.fetchone()
     return row
 
-def tally_votes(conn, proposal_id: int):
-    cur = conn.cursor()
-    cur.execute("SELECT vote, COUNT(*) as c FROM votes WHERE proposal_id=? GROUP BY vote", (proposal_id,))
-    counts = {"yes": 0, "no": 0, "abstain": 0}
-    for r in cur.fetchall():
-        counts[r["vote"]] = r["c"]
-    return counts["yes"], counts["no"], counts["abstain"]
-
 # --- Routes ---
 @app.post("/proposals/", response_model=ProposalOut, status_code=status.HTTP_201_CREATED)
-def create_proposal(payload: ProposalCreate):
-    conn = get_conn()
-    cur = conn.cursor()
-    created_at = datetime.utcnow()
-    deadline = created_at + timedelta(days=payload.days_open)
-    cur.execute("INSERT INTO proposals (title, description, created_at, deadline, status) VALUES (?,?,?,?,?)",
-                (payload.title, payload.description, created_at.isoformat(), deadline.isoformat(), ProposalStatus.active.value))
-    conn.commit()
-    pid = cur.lastrowid
-    row = get_proposal_or_404(conn, pid)
-    yes, no, abstain = tally_votes(conn, pid)
-    conn.close()
-    return ProposalOut(id=row["id"], title=row["title"], description=row["description"],
-                       created_at=datetime.fromisoformat(row["created_at"]),
-                       deadline=datetime.fromisoformat(row["deadline"]),
-                       status=row["status"], yes_count=yes, no_count=no, abstain_count=abstain)
+async def create_proposal(payload: ProposalCreate, conn: sqlite3.Connection = Depends(get_conn)):
+    created_at = int(time.time())
+    deadline = created_at + payload.days_open * 86400
+    # a non-positive days_open is already past its deadline
+    initial_status = ProposalStatus.active if deadline > created_at else ProposalStatus.expired
+
+    def insert():
+        cur = conn.cursor()
+        with write_transaction(conn):
+            cur.execute(SQL_INSERT_PROPOSAL,
+                        (payload.title, payload.description, created_at, deadline, initial_status.value))
+            return cur.fetchone()
+
+    row = await run_db(insert)
+    invalidate_cache(("proposals",))
+    return proposal_out(row)
 
 @app.get("/proposals/", response_model=List[ProposalOut])
-def get_proposals():
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT id FROM proposals")
-    ids = [r["id"] for r in cur.fetchall()]
-    results = []
-    for pid in ids:
-        row = get_proposal_or_404(conn, pid)
-        yes, no, abstain = tally_votes(conn, pid)
-        results.append(ProposalOut(id=row["id"], title=row["title"], description=row["description"],
-                                   created_at=datetime.fromisoformat(row["created_at"]),
-                                   deadline=datetime.fromisoformat(row["deadline"]),
-                                   status=row["status"], yes_count=yes, no_count=no, abstain_count=abstain))
-    conn.close()
-    return results
+async def get_proposals(if_none_match: Optional[str] = Header(None), conn: sqlite3.Connection = Depends(get_conn)):
+    await sweep_expired(conn)
+
+    def build():
+        cur = conn.cursor()
+        cur.execute(SQL_LIST_PROPOSALS)
+        proposals = [proposal_out(row) for row in cur]
+        return PROPOSAL_LIST_ADAPTER.dump_json(proposals)
+
+    return await cached_json(("proposals",), build, if_none_match)
 
 @app.get("/proposals/{proposal_id}", response_model=ProposalOut)
-def get_proposal(proposal_id: int):
-    conn = get_conn()
-    row = get_proposal_or_404(conn, proposal_id)
-    yes, no, abstain = tally_votes(conn, proposal_id)
-    conn.close()
-    return ProposalOut(id=row["id"], title=row["title"], description=row["description"],
-                       created_at=datetime.fromisoformat(row["created_at"]),
-                       deadline=datetime.fromisoformat(row["deadline"]),
-                       status=row["status"], yes_count=yes, no_count=no, abstain_count=abstain)
+async def get_proposal(proposal_id: int, if_none_match: Optional[str] = Header(None),
+                       conn: sqlite3.Connection = Depends(get_conn)):
+    await sweep_expired(conn)
 
-@app.post("/proposals/{proposal_id}/vote", response_model=VoteOut, status_code=status.HTTP_201_CREATED)
-def submit_vote(proposal_id: int, payload: VoteCreate):
-    conn = get_conn()
-    row = get_proposal_or_404(conn, proposal_id)
-    if row["status"] != ProposalStatus.active.value:
-        conn.close()
-        raise HTTPException(status_code=400, detail="Proposal is not active; voting is not allowed.")
+    def build():
+        row = get_proposal_or_404(conn, proposal_id)
+        return proposal_out(row).model_dump_json().encode()
 
-    cur = conn.cursor()
-    cur.execute("SELECT id FROM votes WHERE proposal_id=? AND voter_name=?", (proposal_id, payload.voter_name))
-    if cur.fetchone():
-        conn.close()
+    return await cached_json(("proposal", proposal_id), build, if_none_match)
+
+@app.post("/proposals/{proposal_id}/vote", response_model=VoteOut, status_code=status.HTTP_201_CREATED)
+async def submit_vote(proposal_id: int, payload: VoteCreate, conn: sqlite3.Connection = Depends(get_conn)):
+    def insert():
+        now = int(time.time())
+        cur = conn.cursor()
+        # a single statement is atomic on its own, so the happy path needs no explicit transaction
+        cur.execute(SQL_INSERT_VOTE, (proposal_id, payload.voter_name, payload.vote, now,
+                                      proposal_id, now, proposal_id, payload.voter_name))
+        v = cur.fetchone()
+        if v:
+            return v
+        # nothing inserted: work out why, against the same now the INSERT checked, since
+        # the sweep is memoized per second and may not have expired this proposal yet
+        row = get_proposal_or_404(conn, proposal_id)
+        if row["status"] != ProposalStatus.active.value or row["deadline"] < now:
+            raise HTTPException(status_code=400, detail="Proposal is not active; voting is not allowed.")
         raise HTTPException(status_code=400, detail="Voter has already voted. Revoke first to change vote.")
-    voted_at = datetime.utcnow()
-    cur.execute("INSERT INTO votes (proposal_id, voter_name, vote, voted_at) VALUES (?,?,?,?)",
-                (proposal_id, payload.voter_name, payload.vote, voted_at.isoformat()))
-    conn.commit()
-    vid = cur.lastrowid
-    cur.execute("SELECT * FROM votes WHERE id=?", (vid,))
-    v = cur.fetchone()
-    conn.close()
-    return VoteOut(id=v["id"], proposal_id=v["proposal_id"], voter_name=v["voter_name"],
-                   vote=v["vote"], voted_at=datetime.fromisoformat(v["voted_at"]))
+
+    v = await run_db(insert)
+    invalidate_cache(("proposal", proposal_id), ("proposals",))
+    return vote_out(v)
+
+@app.post("/proposals/{proposal_id}/votes/bulk", response_model=List[VoteOut], status_code=status.HTTP_201_CREATED)
+async def submit_votes_bulk(proposal_id: int, payload: List[VoteCreate],
+                            conn: sqlite3.Connection = Depends(get_conn)):
+    voted_at = int(time.time())
+    rows = [(proposal_id, v.voter_name, v.vote, voted_at) for v in payload]
+
+    def insert():
+        with write_transaction(conn):
+            _sweep_expired(conn)
+            row = get_proposal_or_404(conn, proposal_id)
+            if row["status"] != ProposalStatus.active.value:
+                raise HTTPException(status_code=400, detail="Proposal is not active; voting is not allowed.")
+
+            cur = conn.cursor()
+            try:
+                cur.executemany(SQL_INSERT_VOTE_BULK, rows)
+            except sqlite3.IntegrityError:
+                raise HTTPException(status_code=400, detail="Voter has already voted. Revoke first to change vote.")
+            # writes are serialized on the database thread, so the newest len(rows) votes are the ones just inserted
+            cur.execute(SQL_LAST_VOTES, (len(rows),))
+            return cur.fetchall()
+
+    inserted = await run_db(insert)
+    invalidate_cache(("proposal", proposal_id), ("proposals",))
+    return [vote_out(v) for v in inserted]
 
 @app.delete("/votes/{vote_id}", status_code=status.HTTP_204_NO_CONTENT)
-def revoke_vote(vote_id: int):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM votes WHERE id=?", (vote_id,))
-    v = cur.fetchone()
-    if not v:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Vote not found")
-    p = get_proposal_or_404(conn, v["proposal_id"])
-    if p["status"] != ProposalStatus.active.value:
-        conn.close()
-        raise HTTPException(status_code=400, detail="Cannot revoke vote: proposal not active.")
-    cur.execute("DELETE FROM votes WHERE id=?", (vote_id,))
-    conn.commit()
-    conn.close()
+async def revoke_vote(vote_id: int, conn: sqlite3.Connection = Depends(get_conn)):
+    def delete():
+        cur = row_cursor(conn)
+        with write_transaction(conn):
+            cur.execute(SQL_GET_VOTE, (vote_id,))
+            v = cur.fetchone()
+            if not v:
+                raise HTTPException(status_code=404, detail="Vote not found")
+            _sweep_expired(conn)
+            p = get_proposal_or_404(conn, v["proposal_id"])
+            if p["status"] != ProposalStatus.active.value:
+                raise HTTPException(status_code=400, detail="Cannot revoke vote: proposal not active.")
+            cur.execute(SQL_DELETE_VOTE, (vote_id,))
+        return v["proposal_id"]
+
+    proposal_id = await run_db(delete)
+    invalidate_cache(("proposal", proposal_id), ("proposals",))
     return None
 
 @app.patch("/proposals/{proposal_id}/close", response_model=ProposalOut)
-def close_proposal(proposal_id: int, x_admin_token: Optional[str] = Header(None)):
+async def close_proposal(proposal_id: int, x_admin_token: Optional[str] = Header(None),
+                         conn: sqlite3.Connection = Depends(get_conn)):
     ADMIN_TOKEN = "secret-admin-token"
     if x_admin_token != ADMIN_TOKEN:
         raise HTTPException(status_code=403, detail="Admin token required")
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM proposals WHERE id=?", (proposal_id,))
-    row = cur.fetchone()
-    if not row:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Proposal not found")
-    cur.execute("UPDATE proposals SET status=? WHERE id=?", (ProposalStatus.closed.value, proposal_id))
-    conn.commit()
-    row = get_proposal_or_404(conn, proposal_id)
-    yes, no, abstain = tally_votes(conn, proposal_id)
-    conn.close()
-    return ProposalOut(id=row["id"], title=row["title"], description=row["description"],
-                       created_at=datetime.fromisoformat(row["created_at"]),
-                       deadline=datetime.fromisoformat(row["deadline"]),
-                       status=row["status"], yes_count=yes, no_count=no, abstain_count=abstain)
+
+    def close():
+        cur = row_cursor(conn)
+        with write_transaction(conn):
+            cur.execute(SQL_GET_PROPOSAL, (proposal_id,))
+            row = cur.fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="Proposal not found")
+            cur.execute(SQL_SET_PROPOSAL_STATUS, (ProposalStatus.closed.value, proposal_id))
+            return get_proposal_or_404(conn, proposal_id)
+
+    row = await run_db(close)
+    invalidate_cache(("proposal", proposal_id), ("proposals",))
+    return proposal_out(row)
 
 @app.get("/votes/", response_model=List[VoteOut])
-def list_votes():
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM votes")
-    rows = cur.fetchall()
-    conn.close()
-    return [VoteOut(id=r["id"], proposal_id=r["proposal_id"], voter_name=r["voter_name"],
-                    vote=r["vote"], voted_at=datetime.fromisoformat(r["voted_at"])) for r in rows]
+async def list_votes(conn: sqlite3.Connection = Depends(get_conn)):
+    def fetch():
+        cur = conn.cursor()
+        cur.execute(SQL_LIST_VOTES)
+        votes = [vote_out(row) for row in cur]
+        return VOTE_LIST_ADAPTER.dump_json(votes)
+
+    return Response(content=await run_db(fetch), media_type="application/json")
 
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}